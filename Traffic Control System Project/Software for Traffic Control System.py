@@ -17,21 +17,34 @@ Version: 2.0.0
 
 import random
 import json
-import statistics
+import math
 import uuid
 import logging
 import csv
+import copy
+import io
 import os
-from dataclasses import dataclass, field, asdict
+import sys
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Tuple, Dict, Optional, Any
+from functools import lru_cache
+from itertools import count, islice
+from operator import itemgetter
+from typing import List, Tuple, Dict, Optional, Any, Deque, NamedTuple, Union
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
 import time
 
+try:
+    import orjson  # Optional: much faster JSON export when installed
+except ImportError:
+    orjson = None
+
 ####################
 # Configuration
 ####################
@@ -132,10 +145,21 @@ class Direction(Enum):
 # Data Classes
 ####################
 
-@dataclass
+# Sequential IDs for high-volume runtime objects (much cheaper than uuid4)
+_id_counter = count()
+
+def _next_id(prefix: str) -> str:
+    """Generate a process-unique ID such as 'vehicle_42'"""
+    return f"{prefix}_{next(_id_counter)}"
+
+def _ns_to_datetime(timestamp_ns: int) -> datetime:
+    """Convert a time.time_ns() timestamp to a local datetime"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9)
+
+@dataclass(slots=True)
 class Vehicle:
     """Represents a vehicle in the traffic system"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: _next_id("vehicle"))
     type: VehicleType = VehicleType.CAR
     speed: float = 0.0  # km/h
     position: Tuple[float, float] = (0.0, 0.0)
@@ -143,7 +167,7 @@ class Vehicle:
     priority: int = 0
     emergency_level: EmergencyLevel = EmergencyLevel.NONE
     direction: Direction = Direction.UNKNOWN  # Direction of travel
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for serialization"""
@@ -156,18 +180,18 @@ class Vehicle:
             'priority': self.priority,
             'emergency_level': self.emergency_level.value,
             'direction': self.direction.value,
-            'timestamp': self.timestamp.isoformat()
+            'timestamp': _ns_to_datetime(self.timestamp_ns).isoformat()
         }
 
-@dataclass
+@dataclass(slots=True)
 class TrafficSensor:
     """Represents a traffic sensor monitoring vehicle flow"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: _next_id("sensor"))
     position: Tuple[float, float] = (0.0, 0.0)
     vehicle_count: int = 0
     average_speed: float = 0.0  # km/h
     queue_length: int = 0
-    last_update: datetime = field(default_factory=datetime.now)
+    last_update_ns: int = field(default_factory=time.time_ns)
     is_active: bool = True
     
     def to_dict(self) -> Dict:
@@ -178,11 +202,11 @@ class TrafficSensor:
             'vehicle_count': self.vehicle_count,
             'average_speed': self.average_speed,
             'queue_length': self.queue_length,
-            'last_update': self.last_update.isoformat(),
+            'last_update': _ns_to_datetime(self.last_update_ns).isoformat(),
             'is_active': self.is_active
         }
 
-@dataclass
+@dataclass(slots=True)
 class IntersectionConfig:
     """Configuration for a traffic intersection"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -199,7 +223,55 @@ class IntersectionConfig:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for serialization"""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'position': self.position,
+            'roads': list(self.roads),
+            'default_green_time': self.default_green_time,
+            'default_yellow_time': self.default_yellow_time,
+            'default_pre_green_time': self.default_pre_green_time,
+            'default_red_time': self.default_red_time,
+            'max_green_time': self.max_green_time,
+            'min_green_time': self.min_green_time,
+            'pedestrian_crossing_time': self.pedestrian_crossing_time,
+            'emergency_override': self.emergency_override
+        }
+
+class SensorAggregate(NamedTuple):
+    """Summary of one step's sensor readings, computed in a single pass"""
+    sensor_count: int = 0
+    total_vehicles: int = 0
+    average_vehicle_count: float = 0.0
+    average_queue_length: float = 0.0
+    active_count: int = 0
+    active_average_speed: float = 0.0
+    active_average_queue_length: float = 0.0
+
+def aggregate_sensors(sensors: List[TrafficSensor]) -> SensorAggregate:
+    """Sum every per-sensor field needed by the controllers in one loop"""
+    total_vehicles = total_queue = 0
+    active_count = active_queue = 0
+    active_speed = 0.0
+    for sensor in sensors:
+        total_vehicles += sensor.vehicle_count
+        total_queue += sensor.queue_length
+        if sensor.is_active:
+            active_count += 1
+            active_speed += sensor.average_speed
+            active_queue += sensor.queue_length
+    
+    sensor_count = len(sensors)
+    if not sensor_count:
+        return SensorAggregate()
+    return SensorAggregate(
+        sensor_count=sensor_count,
+        total_vehicles=total_vehicles,
+        average_vehicle_count=total_vehicles / sensor_count,
+        average_queue_length=total_queue / sensor_count,
+        active_count=active_count,
+        active_average_speed=active_speed / active_count if active_count else 0.0,
+        active_average_queue_length=active_queue / active_count if active_count else 0.0
+    )
 
 ####################
 # Logging Manager
@@ -211,15 +283,17 @@ class LoggingManager:
     def __init__(self, log_dir: str = "logs", log_level: str = "INFO"):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self._log_day = None
+        self._log_path = None
         
         # Setup logging
-        log_file = self.log_dir / f"traffic_system_{datetime.now().strftime('%Y%m%d')}.log"
+        log_file = self._daily_log_path()
         
         logging.basicConfig(
             level=getattr(logging, log_level),
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_file),
+                logging.FileHandler(log_file, encoding='utf-8'),
                 logging.StreamHandler()
             ]
         )
@@ -227,29 +301,69 @@ class LoggingManager:
         self.logger = logging.getLogger("TrafficControlSystem")
         self.logger.info("Logging system initialized")
     
-    def log_event(self, level: str, message: str, **kwargs):
-        """Log an event with additional context"""
-        log_message = f"{message} | {kwargs}" if kwargs else message
-        getattr(self.logger, level.lower())(log_message)
+    def log_event(self, level: str, message: str, *args, **kwargs):
+        """Log an event with additional context, formatting %-style args only if emitted"""
+        # 'exception' logs at ERROR with the active traceback, like Logger.exception
+        exc_info = level.lower() == 'exception'
+        level_no = logging.ERROR if exc_info else logging.getLevelName(level.upper())
+        if not isinstance(level_no, int):
+            raise ValueError(f"Unknown log level: {level}")
+        if not self.logger.isEnabledFor(level_no):
+            return
+        if kwargs:
+            # A message without args is literal text, so keep its '%' out of the template
+            if not args:
+                message = message.replace('%', '%%')
+            message = f"{message} | %s"
+            args = (*args, kwargs)
+        self.logger.log(level_no, message, *args, exc_info=exc_info)
+    
+    def _daily_log_path(self) -> Path:
+        """Get today's log file path, rebuilt only when the day rolls over"""
+        today = time.strftime('%Y%m%d')
+        if today != self._log_day:
+            self._log_day = today
+            self._log_path = self.log_dir / f"traffic_system_{today}.log"
+        return self._log_path
     
     def get_recent_logs(self, lines: int = 100) -> List[str]:
         """Get recent log entries"""
-        log_file = self.log_dir / f"traffic_system_{datetime.now().strftime('%Y%m%d')}.log"
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                return f.readlines()[-lines:]
-        return []
+        log_file = self._daily_log_path()
+        if not log_file.exists():
+            return []
+        
+        # Read backwards in blocks so memory is bounded by `lines`, not the file size
+        with open(log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            buf = b''
+            while end > 0 and buf.count(b'\n') <= lines:
+                block = min(8192, end)
+                end -= block
+                f.seek(end)
+                buf = f.read(block) + buf
+        # Decode with universal newlines so entries end in '\n' as with a text-mode read
+        text = io.StringIO(buf.decode('utf-8', errors='replace'), newline=None)
+        return text.readlines()[-lines:]
 
 ####################
 # Configuration Manager
 ####################
 
+def _deep_merge(base: Dict, overrides: Dict):
+    """Merge overrides into base in place, recursing into nested sections"""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = value
+
 class ConfigurationManager:
     """Manages system configuration"""
     
     def __init__(self, config_file: str = "config.json"):
         self.config_file = Path(config_file)
-        self.config = DEFAULT_CONFIG.copy()
+        self.config = copy.deepcopy(DEFAULT_CONFIG)
         self.load_config()
     
     def load_config(self) -> Dict:
@@ -258,12 +372,26 @@ class ConfigurationManager:
             try:
                 with open(self.config_file, 'r') as f:
                     loaded_config = json.load(f)
-                    self.config.update(loaded_config)
-                    return self.config
+                    _deep_merge(self.config, loaded_config)
             except Exception as e:
-                logging.error(f"Failed to load config: {e}")
+                logging.error("Failed to load config: %s", e)
+        self._rebuild_lookup()
         return self.config
     
+    def _rebuild_lookup(self):
+        """Flatten the nested config into a dotted-path lookup table"""
+        flat = {}
+        
+        def walk(node: Dict, prefix: str):
+            for key, value in node.items():
+                path = sys.intern(f"{prefix}{key}")
+                flat[path] = value
+                if isinstance(value, dict):
+                    walk(value, f"{path}.")
+        
+        walk(self.config, "")
+        self._flat = flat
+    
     def save_config(self) -> bool:
         """Save configuration to file"""
         try:
@@ -271,19 +399,12 @@ class ConfigurationManager:
                 json.dump(self.config, f, indent=2)
             return True
         except Exception as e:
-            logging.error(f"Failed to save config: {e}")
+            logging.error("Failed to save config: %s", e)
             return False
     
     def get(self, key_path: str, default=None):
         """Get configuration value using dot notation"""
-        keys = key_path.split('.')
-        value = self.config
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key, default)
-            else:
-                return default
-        return value
+        return self._flat.get(key_path, default)
     
     def set(self, key_path: str, value):
         """Set configuration value using dot notation"""
@@ -294,11 +415,30 @@ class ConfigurationManager:
                 config[key] = {}
             config = config[key]
         config[keys[-1]] = value
+        self._rebuild_lookup()
 
 ####################
 # Data Persistence Manager
 ####################
 
+_persistence_logger = logging.getLogger("TrafficControlSystem.Persistence")
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values the JSON encoders don't handle natively"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+class PersistenceEncoder(json.JSONEncoder):
+    """Stdlib JSON encoder applying the same conversions as the orjson path"""
+    
+    def default(self, o: Any) -> Any:
+        return _json_default(o)
+
 class DataPersistenceManager:
     """Handles saving and loading system state"""
     
@@ -306,6 +446,22 @@ class DataPersistenceManager:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
     
+    def _write_json(self, filepath: Path, data: Any):
+        """Write data as indented JSON, using orjson when available"""
+        # Write beside the target and swap it in, so an interrupted write never truncates it
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+        try:
+            if orjson is not None:
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2))
+            else:
+                with open(tmp_path, 'w') as f:
+                    f.write(json.dumps(data, indent=2, cls=PersistenceEncoder))
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     def save_system_state(self, system_data: Dict, filename: str = None) -> bool:
         """Save complete system state"""
         if filename is None:
@@ -313,28 +469,28 @@ class DataPersistenceManager:
         
         filepath = self.data_dir / filename
         try:
-            with open(filepath, 'w') as f:
-                json.dump(system_data, f, indent=2, default=str)
-            logging.info(f"System state saved to {filepath}")
+            self._write_json(filepath, system_data)
+            _persistence_logger.info("System state saved to %s", filepath)
             return True
         except Exception as e:
-            logging.error(f"Failed to save system state: {e}")
+            _persistence_logger.error("Failed to save system state: %s", e)
             return False
     
     def load_system_state(self, filename: str) -> Optional[Dict]:
         """Load system state from file"""
         filepath = self.data_dir / filename
         if not filepath.exists():
-            logging.error(f"State file not found: {filepath}")
+            _persistence_logger.error("State file not found: %s", filepath)
             return None
         
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            logging.info(f"System state loaded from {filepath}")
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            _persistence_logger.info("System state loaded from %s", filepath)
             return data
         except Exception as e:
-            logging.error(f"Failed to load system state: {e}")
+            _persistence_logger.error("Failed to load system state: %s", e)
             return None
     
     def export_analytics(self, analytics_data: List[Dict], format: str = "json") -> bool:
@@ -345,12 +501,11 @@ class DataPersistenceManager:
             filename = f"analytics_{timestamp}.json"
             filepath = self.data_dir / filename
             try:
-                with open(filepath, 'w') as f:
-                    json.dump(analytics_data, f, indent=2, default=str)
-                logging.info(f"Analytics exported to {filepath}")
+                self._write_json(filepath, analytics_data)
+                _persistence_logger.info("Analytics exported to %s", filepath)
                 return True
             except Exception as e:
-                logging.error(f"Failed to export analytics: {e}")
+                _persistence_logger.error("Failed to export analytics: %s", e)
                 return False
         
         elif format == "csv":
@@ -358,15 +513,20 @@ class DataPersistenceManager:
             filepath = self.data_dir / filename
             try:
                 if analytics_data:
-                    keys = analytics_data[0].keys()
+                    keys = list(analytics_data[0].keys())
+                    # itemgetter pulls each row's values in C instead of per-key dict lookups
+                    if len(keys) > 1:
+                        row_values = itemgetter(*keys)
+                    else:
+                        row_values = lambda row: (row[keys[0]],)
                     with open(filepath, 'w', newline='') as f:
-                        writer = csv.DictWriter(f, fieldnames=keys)
-                        writer.writeheader()
-                        writer.writerows(analytics_data)
-                    logging.info(f"Analytics exported to {filepath}")
+                        writer = csv.writer(f)
+                        writer.writerow(keys)
+                        writer.writerows(map(row_values, analytics_data))
+                    _persistence_logger.info("Analytics exported to %s", filepath)
                     return True
             except Exception as e:
-                logging.error(f"Failed to export analytics: {e}")
+                _persistence_logger.error("Failed to export analytics: %s", e)
                 return False
         
         return False
@@ -388,13 +548,11 @@ class PerformanceMonitor:
             'system_uptime': 0.0
         }
         self.start_time = datetime.now()
-        self.step_times = []
+        self.step_times = deque(maxlen=1000)
     
     def track_step(self, step_duration: float):
         """Track step execution time"""
         self.step_times.append(step_duration)
-        if len(self.step_times) > 1000:
-            self.step_times = self.step_times[-1000:]
         self.metrics['total_steps'] += 1
     
     def update_metric(self, metric_name: str, value):
@@ -410,7 +568,7 @@ class PerformanceMonitor:
     def get_metrics_summary(self) -> Dict:
         """Get summary of all metrics"""
         uptime = (datetime.now() - self.start_time).total_seconds()
-        avg_step_time = statistics.mean(self.step_times) if self.step_times else 0
+        avg_step_time = sum(self.step_times) / len(self.step_times) if self.step_times else 0
         
         return {
             **self.metrics,
@@ -441,6 +599,8 @@ class PerformanceMonitor:
 # Report Generator
 ####################
 
+_report_logger = logging.getLogger("TrafficControlSystem.Reports")
+
 class ReportGenerator:
     """Generates traffic reports and analytics"""
     
@@ -450,38 +610,39 @@ class ReportGenerator:
     
     def generate_traffic_report(self, system_data: Dict) -> str:
         """Generate comprehensive traffic report"""
+        buffer = io.StringIO()
+        self.generate_traffic_report_to(buffer, system_data)
+        return buffer.getvalue()
+    
+    def generate_traffic_report_to(self, fp, system_data: Dict):
+        """Write the traffic report straight to a text stream or open file"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        analytics = system_data.get('analytics') or {}
+        performance = system_data.get('performance') or {}
+        rule = '=' * 80
+        w = fp.write
         
-        report = f"""
-{'='*80}
-TRAFFIC CONTROL SYSTEM REPORT
-{'='*80}
-Generated: {timestamp}
-
-SYSTEM STATUS
--------------
-Status: {system_data.get('system_status', 'UNKNOWN')}
-Weather: {system_data.get('weather', 'UNKNOWN')}
-Active Intersections: {system_data.get('intersection_count', 0)}
-Active Sensors: {system_data.get('sensor_count', 0)}
-Active Emergencies: {system_data.get('active_emergencies', 0)}
-
-TRAFFIC ANALYTICS
------------------
-Total Vehicles: {system_data.get('analytics', {}).get('total_vehicles', 0)}
-Average Speed: {system_data.get('analytics', {}).get('average_speed', 0):.1f} km/h
-Congestion Level: {system_data.get('analytics', {}).get('congestion_level', 0)*100:.1f}%
-Anomalies Detected: {len(system_data.get('analytics', {}).get('anomalies', []))}
-
-PERFORMANCE METRICS
--------------------
-Total Steps: {system_data.get('performance', {}).get('total_steps', 0)}
-System Uptime: {system_data.get('performance', {}).get('system_uptime', 0):.1f}s
-Average Step Time: {system_data.get('performance', {}).get('average_step_time', 0):.4f}s
-
-{'='*80}
-"""
-        return report
+        w(f"\n{rule}\nTRAFFIC CONTROL SYSTEM REPORT\n{rule}\nGenerated: {timestamp}\n\n")
+        
+        w("SYSTEM STATUS\n-------------\n")
+        w(f"Status: {system_data.get('system_status', 'UNKNOWN')}\n")
+        w(f"Weather: {system_data.get('weather', 'UNKNOWN')}\n")
+        w(f"Active Intersections: {system_data.get('intersection_count', 0)}\n")
+        w(f"Active Sensors: {system_data.get('sensor_count', 0)}\n")
+        w(f"Active Emergencies: {system_data.get('active_emergencies', 0)}\n\n")
+        
+        w("TRAFFIC ANALYTICS\n-----------------\n")
+        w(f"Total Vehicles: {analytics.get('total_vehicles', 0)}\n")
+        w(f"Average Speed: {analytics.get('average_speed', 0):.1f} km/h\n")
+        w(f"Congestion Level: {analytics.get('congestion_level', 0)*100:.1f}%\n")
+        w(f"Anomalies Detected: {len(analytics.get('anomalies', []))}\n\n")
+        
+        w("PERFORMANCE METRICS\n-------------------\n")
+        w(f"Total Steps: {performance.get('total_steps', 0)}\n")
+        w(f"System Uptime: {performance.get('system_uptime', 0):.1f}s\n")
+        w(f"Average Step Time: {performance.get('average_step_time', 0):.4f}s\n\n")
+        
+        w(f"{rule}\n")
     
     def save_report(self, report: str, filename: str = None) -> bool:
         """Save report to file"""
@@ -492,19 +653,37 @@ Average Step Time: {system_data.get('performance', {}).get('average_step_time',
         try:
             with open(filepath, 'w') as f:
                 f.write(report)
-            logging.info(f"Report saved to {filepath}")
+            _report_logger.info("Report saved to %s", filepath)
             return True
         except Exception as e:
-            logging.error(f"Failed to save report: {e}")
+            _report_logger.error("Failed to save report: %s", e)
             return False
 
 ####################
 # Advanced Traffic Light
 ####################
 
+_light_logger = logging.getLogger("TrafficControlSystem.TrafficLight")
+
+# Weather that adds extra green time (see calculate_optimal_timing)
+_BAD_WEATHER = frozenset({WeatherCondition.RAIN, WeatherCondition.SNOW, WeatherCondition.STORM})
+
+# Normal signal cycle: state -> (timing key that bounds it, next state)
+PHASE_TRANSITIONS: Dict[TrafficLightState, Tuple[str, TrafficLightState]] = {
+    TrafficLightState.RED: ('red', TrafficLightState.PRE_GREEN),
+    TrafficLightState.PRE_GREEN: ('pre_green', TrafficLightState.GREEN),
+    TrafficLightState.GREEN: ('green', TrafficLightState.YELLOW),
+    TrafficLightState.YELLOW: ('yellow', TrafficLightState.RED),
+    TrafficLightState.FLASHING_YELLOW: ('yellow', TrafficLightState.RED)
+}
+
 class AdvancedTrafficLight:
     """Advanced traffic light with adaptive timing"""
     
+    __slots__ = ('intersection_id', 'config', 'current_state', 'state_start_time',
+                 'green_time_elapsed', 'cycle_count', 'emergency_active', 'last_state_change',
+                 'traffic_patterns', 'adaptation_factor', 'update')
+    
     def __init__(self, intersection_id: str, config: IntersectionConfig):
         self.intersection_id = intersection_id
         self.config = config
@@ -516,6 +695,7 @@ class AdvancedTrafficLight:
         self.last_state_change = 0
         self.traffic_patterns = {}
         self.adaptation_factor = 1.0
+        self.update = self._update_normal
     
     def get_current_state_duration(self, current_step: int) -> float:
         """Get duration of current state"""
@@ -523,7 +703,9 @@ class AdvancedTrafficLight:
     
     def change_state(self, new_state: TrafficLightState, current_step: int):
         """Change traffic light state"""
-        logging.debug(f"Intersection {self.intersection_id}: {self.current_state.value} -> {new_state.value}")
+        if _light_logger.isEnabledFor(logging.DEBUG):
+            _light_logger.debug("Intersection %s: %s -> %s", self.intersection_id,
+                                self.current_state.value, new_state.value)
         self.current_state = new_state
         self.state_start_time = current_step
         self.last_state_change = current_step
@@ -535,101 +717,133 @@ class AdvancedTrafficLight:
                                  weather: WeatherCondition,
                                  emergency_level: EmergencyLevel,
                                  is_rush_hour: bool = False,
-                                 is_night: bool = False) -> Dict[str, float]:
+                                 is_night: bool = False,
+                                 aggregate: Optional[SensorAggregate] = None) -> Dict[str, float]:
         """Calculate optimal timing based on conditions, synchronized with HTML formula"""
-        # Base timings from config
-        timing = {
-            'green': self.config.default_green_time,
-            'yellow': self.config.default_yellow_time,
-            'pre_green': self.config.default_pre_green_time,
-            'red': self.config.default_red_time
-        }
-        
-        if emergency_level != EmergencyLevel.NONE:
-            timing['green'] = self.config.min_green_time
-            self.emergency_active = True
-        else:
-            self.emergency_active = False
+        self.emergency_active = emergency_level != EmergencyLevel.NONE
+        if aggregate is None:
+            aggregate = aggregate_sensors(sensor_data)
+        
+        # Bucket the density to 0.5 vehicles so repeated conditions hit the cache
+        avg_bucket = None
+        if aggregate.sensor_count:
+            avg_bucket = round(aggregate.average_vehicle_count * 2) / 2
+        
+        green, yellow, pre_green, red = self._timing_core(
+            avg_bucket, weather, self.emergency_active, is_rush_hour, is_night,
+            self.config.default_green_time, self.config.default_yellow_time,
+            self.config.default_pre_green_time, self.config.default_red_time,
+            self.config.min_green_time, self.config.max_green_time
+        )
+        return {'green': green, 'yellow': yellow, 'pre_green': pre_green, 'red': red}
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _timing_core(avg_bucket: Optional[float], weather: WeatherCondition,
+                     emergency: bool, is_rush_hour: bool, is_night: bool,
+                     green_time: float, yellow_time: float, pre_green_time: float,
+                     red_time: float, min_green_time: float,
+                     max_green_time: float) -> Tuple[float, float, float, float]:
+        """Pure timing calculation over hashable inputs, memoized across lights"""
+        green = min_green_time if emergency else green_time
         
         # Density-based logic from HTML: 3.0s base + 3.5s per car
-        if sensor_data:
-            avg_vehicle_count = sum(sensor.vehicle_count for sensor in sensor_data) / len(sensor_data)
+        if avg_bucket is not None:
             # Match HTML: this.dynamicDuration = Math.min(CONFIG.MAX_PHASE_DURATION, 3.0 + (dens * 3.5));
-            timing['green'] = 3.0 + (avg_vehicle_count * 3.5)
+            green = 3.0 + (avg_bucket * 3.5)
             
             # Weather-based addition from HTML: if (this.isRaining || this.isSnowing) this.dynamicDuration += 4.0;
-            if weather in [WeatherCondition.RAIN, WeatherCondition.SNOW, WeatherCondition.STORM]:
-                timing['green'] += 4.0
+            if weather in _BAD_WEATHER:
+                green += 4.0
             
             # Rush hour multiplier (HTML slightly slows flux in rush hour)
             if is_rush_hour:
-                timing['green'] *= 1.2
+                green *= 1.2
             
             # Night adjustment (usually less green time if empty, but HTML doesn't explicitly change timing for night, just visuals)
             if is_night:
-                timing['green'] *= 0.8
+                green *= 0.8
         
         # Apply bounds
-        timing['green'] = max(self.config.min_green_time,
-                             min(self.config.max_green_time, timing['green']))
+        green = max(min_green_time, min(max_green_time, green))
         
-        return timing
+        return green, yellow_time, pre_green_time, red_time
 
     def update_state(self, current_step: int, sensor_data: List[TrafficSensor],
                      weather: WeatherCondition,
                      emergency_level: EmergencyLevel,
                      power_outage: bool = False,
                      is_scramble: bool = False,
-                     is_rush_hour: bool = False):
+                     is_rush_hour: bool = False,
+                     aggregate: Optional[SensorAggregate] = None):
         """Update traffic light state with system-wide scenario support"""
-        
-        # Scenario: Power Outage (Flashing Yellow)
+        update = self._variant_for(power_outage, is_scramble)
+        update(current_step, sensor_data, weather, emergency_level, is_rush_hour, aggregate)
+    
+    def specialize(self, power_outage: bool = False, is_scramble: bool = False):
+        """Bind self.update to the variant for the active scenario so ticks skip the flag checks"""
+        self.update = self._variant_for(power_outage, is_scramble)
+    
+    def _variant_for(self, power_outage: bool, is_scramble: bool):
+        """Pick the update variant for the given scenario flags"""
         if power_outage:
-            # Flash yellow every 2 steps
-            if current_step % 2 == 0:
-                self.current_state = TrafficLightState.FLASHING_YELLOW
-            else:
-                self.current_state = TrafficLightState.RED
-            return
-
-        # Scenario: Pedestrian Scramble (All Red)
+            return self._update_outage
         if is_scramble:
+            return self._update_scramble
+        return self._update_normal
+    
+    def _update_outage(self, current_step: int, sensor_data: List[TrafficSensor],
+                       weather: WeatherCondition, emergency_level: EmergencyLevel,
+                       is_rush_hour: bool = False,
+                       aggregate: Optional[SensorAggregate] = None):
+        """Scenario: Power Outage (Flashing Yellow)"""
+        # Flash yellow every 2 steps
+        if current_step % 2 == 0:
+            self.current_state = TrafficLightState.FLASHING_YELLOW
+        else:
             self.current_state = TrafficLightState.RED
-            self.state_start_time = current_step
-            return
-
+    
+    def _update_scramble(self, current_step: int, sensor_data: List[TrafficSensor],
+                         weather: WeatherCondition, emergency_level: EmergencyLevel,
+                         is_rush_hour: bool = False,
+                         aggregate: Optional[SensorAggregate] = None):
+        """Scenario: Pedestrian Scramble (All Red)"""
+        self.current_state = TrafficLightState.RED
+        self.state_start_time = current_step
+    
+    def _update_normal(self, current_step: int, sensor_data: List[TrafficSensor],
+                       weather: WeatherCondition, emergency_level: EmergencyLevel,
+                       is_rush_hour: bool = False,
+                       aggregate: Optional[SensorAggregate] = None):
+        """Adaptive signal cycle with emergency override"""
         # Emergency override
         if emergency_level != EmergencyLevel.NONE:
             if self.current_state != TrafficLightState.GREEN:
                 self.change_state(TrafficLightState.GREEN, current_step)
             return
 
-        timing = self.calculate_optimal_timing(sensor_data, weather, emergency_level, is_rush_hour, weather == WeatherCondition.NIGHT)
+        if aggregate is None:
+            aggregate = aggregate_sensors(sensor_data)
+        timing = self.calculate_optimal_timing(sensor_data, weather, emergency_level, is_rush_hour,
+                                               weather == WeatherCondition.NIGHT, aggregate)
         current_duration = self.get_current_state_duration(current_step)
         
-        if self.current_state == TrafficLightState.RED:
-            if current_duration >= timing['red']:
-                self.change_state(TrafficLightState.PRE_GREEN, current_step)
-        elif self.current_state == TrafficLightState.PRE_GREEN:
-            if current_duration >= timing['pre_green']:
-                self.change_state(TrafficLightState.GREEN, current_step)
-        elif self.current_state == TrafficLightState.GREEN:
-            self.green_time_elapsed = current_duration
-            if current_duration >= timing['green']:
-                self.change_state(TrafficLightState.YELLOW, current_step)
-        elif self.current_state == TrafficLightState.YELLOW or self.current_state == TrafficLightState.FLASHING_YELLOW:
-            if current_duration >= timing['yellow']:
-                self.change_state(TrafficLightState.RED, current_step)
+        transition = PHASE_TRANSITIONS.get(self.current_state)
+        if transition is not None:
+            timing_key, next_state = transition
+            if self.current_state == TrafficLightState.GREEN:
+                self.green_time_elapsed = current_duration
+            if current_duration >= timing[timing_key]:
+                self.change_state(next_state, current_step)
         
-        self._update_adaptation_factor(sensor_data)
+        self._update_adaptation_factor(aggregate)
     
-    def _update_adaptation_factor(self, sensor_data: List[TrafficSensor]):
+    def _update_adaptation_factor(self, aggregate: SensorAggregate):
         """Update adaptation factor based on queue lengths"""
-        if not sensor_data:
+        if not aggregate.sensor_count:
             return
         
-        total_queue_length = sum(sensor.queue_length for sensor in sensor_data)
-        avg_queue_length = total_queue_length / len(sensor_data) if sensor_data else 0
+        avg_queue_length = aggregate.average_queue_length
         
         if avg_queue_length > 5:
             self.adaptation_factor = min(2.0, self.adaptation_factor + 0.01)
@@ -652,12 +866,24 @@ class AdvancedTrafficLight:
 class TrafficMonitoringSystem:
     """Monitors and analyzes traffic patterns"""
     
-    def __init__(self):
-        self.sensor_data_history: Dict[str, List[TrafficSensor]] = {}
+    def __init__(self, history_size: int = 100, anomaly_window: int = 10):
+        # Per-sensor vehicle count history, oldest entries dropped automatically
+        self._counts: Dict[str, Deque[int]] = defaultdict(lambda: deque(maxlen=history_size))
+        self.history_size = history_size
+        self.anomaly_window = anomaly_window
         self.anomaly_threshold = 2.0
     
-    def process_sensor_data(self, sensors: List[TrafficSensor]) -> Dict[str, Any]:
+    def process_sensor_data(self, sensors: List[TrafficSensor],
+                            aggregate: Optional[SensorAggregate] = None) -> Dict[str, Any]:
         """Process sensor data and detect anomalies"""
+        processed_data = self.summarize_sensor_data(sensors, aggregate)
+        if sensors:
+            processed_data['anomalies'] = self._detect_anomalies(sensors)
+        return processed_data
+    
+    def summarize_sensor_data(self, sensors: List[TrafficSensor],
+                              aggregate: Optional[SensorAggregate] = None) -> Dict[str, Any]:
+        """Summarize sensor data without recording it in the anomaly history"""
         processed_data = {
             'total_vehicles': 0,
             'average_speed': 0.0,
@@ -669,67 +895,49 @@ class TrafficMonitoringSystem:
         if not sensors:
             return processed_data
         
-        total_vehicles = sum(sensor.vehicle_count for sensor in sensors)
-        active_sensors = [s for s in sensors if s.is_active]
-        
-        if active_sensors:
-            average_speed = sum(sensor.average_speed for sensor in active_sensors) / len(active_sensors)
-            avg_queue_length = sum(sensor.queue_length for sensor in active_sensors) / len(active_sensors)
-            
-            processed_data['total_vehicles'] = total_vehicles
-            processed_data['average_speed'] = average_speed
-            processed_data['congestion_level'] = min(1.0, avg_queue_length / 10.0)
-        
-        anomalies = self._detect_anomalies(sensors)
-        processed_data['anomalies'] = anomalies
+        if aggregate is None:
+            aggregate = aggregate_sensors(sensors)
         
-        self._update_history(sensors)
+        if aggregate.active_count:
+            processed_data['total_vehicles'] = aggregate.total_vehicles
+            processed_data['average_speed'] = aggregate.active_average_speed
+            processed_data['congestion_level'] = min(1.0, aggregate.active_average_queue_length / 10.0)
         
         return processed_data
     
     def _detect_anomalies(self, sensors: List[TrafficSensor]) -> List[Dict]:
-        """Detect traffic anomalies using statistical analysis"""
+        """Detect traffic anomalies and record each reading in the sensor history"""
         anomalies = []
         for sensor in sensors:
-            if sensor.id not in self.sensor_data_history:
-                self.sensor_data_history[sensor.id] = []
-            
-            history = self.sensor_data_history[sensor.id]
+            history = self._counts[sensor.id]
             
-            if len(history) < 5:
-                continue
+            # Score against past readings before this one is appended
+            if len(history) >= 5:
+                vehicle_counts = list(islice(history, max(0, len(history) - self.anomaly_window), None))
+                n = len(vehicle_counts)
+                mean_count = sum(vehicle_counts) / n
+                stdev_count = math.sqrt(sum((c - mean_count) ** 2 for c in vehicle_counts) / (n - 1))
+                if stdev_count > 0:
+                    z_score = abs(sensor.vehicle_count - mean_count) / stdev_count
+                    if z_score > self.anomaly_threshold:
+                        anomalies.append({
+                            'sensor_id': sensor.id,
+                            'type': 'vehicle_count',
+                            'value': sensor.vehicle_count,
+                            'expected_range': (mean_count - 2*stdev_count, mean_count + 2*stdev_count),
+                            'timestamp': _ns_to_datetime(sensor.last_update_ns)
+                        })
             
-            vehicle_counts = [s.vehicle_count for s in history[-10:]]
-            if vehicle_counts:
-                mean_count = statistics.mean(vehicle_counts)
-                if len(vehicle_counts) > 1:
-                    stdev_count = statistics.stdev(vehicle_counts)
-                    if stdev_count > 0:
-                        z_score = abs(sensor.vehicle_count - mean_count) / stdev_count
-                        if z_score > self.anomaly_threshold:
-                            anomalies.append({
-                                'sensor_id': sensor.id,
-                                'type': 'vehicle_count',
-                                'value': sensor.vehicle_count,
-                                'expected_range': (mean_count - 2*stdev_count, mean_count + 2*stdev_count),
-                                'timestamp': sensor.last_update
-                            })
+            history.append(sensor.vehicle_count)
         
         return anomalies
-    
-    def _update_history(self, sensors: List[TrafficSensor]):
-        """Update sensor history"""
-        for sensor in sensors:
-            if sensor.id not in self.sensor_data_history:
-                self.sensor_data_history[sensor.id] = []
-            self.sensor_data_history[sensor.id].append(sensor)
-            if len(self.sensor_data_history[sensor.id]) > 100:
-                self.sensor_data_history[sensor.id] = self.sensor_data_history[sensor.id][-100:]
 
 ####################
 # Emergency Management System
 ####################
 
+_emergency_logger = logging.getLogger("TrafficControlSystem.Emergency")
+
 class EmergencyManagementSystem:
     """Manages emergency vehicles and priority routing"""
     
@@ -743,12 +951,35 @@ class EmergencyManagementSystem:
             WeatherCondition.FOG: 1.8,
             WeatherCondition.STORM: 2.5
         }
+        self._priority_table = self._build_priority_table()
+        # Highest-priority vehicle, recomputed only after registrations change
+        self._highest_priority_vehicle: Optional[Vehicle] = None
+        self._highest_priority_stale = False
+    
+    def _build_priority_table(self) -> Dict[Tuple[EmergencyLevel, VehicleType, WeatherCondition], int]:
+        """Precompute priorities for every emergency level, vehicle type and weather"""
+        priority_map = {
+            EmergencyLevel.NONE: 0,
+            EmergencyLevel.LOW: 1,
+            EmergencyLevel.MEDIUM: 3,
+            EmergencyLevel.HIGH: 7,
+            EmergencyLevel.CRITICAL: 10
+        }
+        table = {}
+        for level, base_priority in priority_map.items():
+            for vehicle_type in VehicleType:
+                priority = base_priority + (5 if vehicle_type == VehicleType.EMERGENCY else 0)
+                for weather in WeatherCondition:
+                    weather_factor = self.weather_impact_factors.get(weather, 1.0)
+                    table[(level, vehicle_type, weather)] = int(priority * weather_factor)
+        return table
     
     def register_emergency_vehicle(self, vehicle: Vehicle) -> bool:
         """Register an emergency vehicle"""
         if vehicle.emergency_level != EmergencyLevel.NONE:
             self.active_emergencies[vehicle.id] = vehicle
-            logging.info(f"Emergency vehicle registered: {vehicle.id} - Level: {vehicle.emergency_level.value}")
+            self._highest_priority_stale = True
+            _emergency_logger.info("Emergency vehicle registered: %s - Level: %s", vehicle.id, vehicle.emergency_level.value)
             return True
         return False
     
@@ -756,31 +987,26 @@ class EmergencyManagementSystem:
         """Unregister an emergency vehicle"""
         if vehicle_id in self.active_emergencies:
             del self.active_emergencies[vehicle_id]
-            logging.info(f"Emergency vehicle unregistered: {vehicle_id}")
+            self._highest_priority_stale = True
+            _emergency_logger.info("Emergency vehicle unregistered: %s", vehicle_id)
             return True
         return False
     
     def calculate_priority(self, vehicle: Vehicle, weather: WeatherCondition) -> int:
         """Calculate vehicle priority"""
-        priority_map = {
-            EmergencyLevel.NONE: 0,
-            EmergencyLevel.LOW: 1,
-            EmergencyLevel.MEDIUM: 3,
-            EmergencyLevel.HIGH: 7,
-            EmergencyLevel.CRITICAL: 10
-        }
-        base_priority = priority_map.get(vehicle.emergency_level, 0)
-        weather_factor = self.weather_impact_factors.get(weather, 1.0)
-        if vehicle.type == VehicleType.EMERGENCY:
-            base_priority += 5
-        return int(base_priority * weather_factor)
+        return self._priority_table[(vehicle.emergency_level, vehicle.type, weather)]
     
     def get_highest_priority_vehicle(self) -> Optional[Vehicle]:
         """Get the highest priority emergency vehicle"""
-        if not self.active_emergencies:
-            return None
-        return max(self.active_emergencies.values(),
-                   key=lambda v: self.calculate_priority(v, WeatherCondition.CLEAR))
+        if self._highest_priority_stale:
+            self._highest_priority_stale = False
+            if self.active_emergencies:
+                self._highest_priority_vehicle = max(
+                    self.active_emergencies.values(),
+                    key=lambda v: self.calculate_priority(v, WeatherCondition.CLEAR))
+            else:
+                self._highest_priority_vehicle = None
+        return self._highest_priority_vehicle
     
     def generate_priority_route(self, vehicle: Vehicle,
                                 intersections: List[IntersectionConfig]) -> List[str]:
@@ -789,16 +1015,95 @@ class EmergencyManagementSystem:
         for intersection in intersections[:3]:
             route.append(intersection.id)
         self.priority_routes[vehicle.id] = route
-        logging.info(f"Priority route generated for {vehicle.id}: {route}")
+        _emergency_logger.info("Priority route generated for %s: %s", vehicle.id, route)
         return route
 
 ####################
 # Main Traffic Control System
 ####################
 
+class IntersectionStates(Mapping):
+    """Per-step snapshot of every light, expanded into per-intersection dicts on first access"""
+    
+    __slots__ = ('_step', '_snapshot', '_states')
+    
+    def __init__(self, step: int, lights: List[AdvancedTrafficLight]):
+        self._step = step
+        self._snapshot = [(light.intersection_id, light.current_state, light.state_start_time, light.cycle_count)
+                          for light in lights]
+        self._states: Optional[Dict[str, Dict]] = None
+    
+    def _expand(self) -> Dict[str, Dict]:
+        states = self._states
+        if states is None:
+            # The snapshot is kept and the dict published in one assignment, so a
+            # concurrent expansion from another thread just builds an equal copy
+            states = {
+                iid: {
+                    'state': state.value,
+                    'duration': self._step - state_start_time,
+                    'cycle_count': cycle_count
+                } for iid, state, state_start_time, cycle_count in self._snapshot
+            }
+            self._states = states
+        return states
+    
+    def __getitem__(self, intersection_id: str) -> Dict:
+        return self._expand()[intersection_id]
+    
+    def __iter__(self):
+        return iter(self._expand())
+    
+    def __len__(self) -> int:
+        return len(self._expand())
+    
+    def __repr__(self) -> str:
+        return repr(self._expand())
+
+@dataclass(slots=True)
+class StepInfo(Mapping):
+    """Result of one simulation step, readable as a read-only dict (enums appear as their values)"""
+    step: int
+    timestamp: datetime
+    system_status: SystemStatus
+    weather: WeatherCondition
+    analytics: Dict[str, Any]
+    intersection_states: IntersectionStates
+    active_emergencies: int
+    
+    _KEYS = ('step', 'timestamp', 'system_status', 'weather', 'analytics',
+             'intersection_states', 'active_emergencies')
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return value.value if isinstance(value, Enum) else value
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
 class InteractiveTrafficControlSystem:
     """Main traffic control system orchestrator"""
     
+    # Weather implied by each scenario; anything not listed runs in clear weather
+    SCENARIO_WEATHER = {
+        Scenario.HEAVY_RAIN: WeatherCondition.RAIN,
+        Scenario.SNOW_BLIZZARD: WeatherCondition.SNOW,
+        Scenario.DENSE_FOG: WeatherCondition.FOG,
+        Scenario.NIGHT: WeatherCondition.NIGHT
+    }
+    
+    # Per-step random walk increments for simulated sensor readings
+    VEHICLE_COUNT_DELTAS = range(-2, 4)
+    QUEUE_LENGTH_DELTAS = range(-1, 3)
+    
+    # Overwritten on every auto-save rather than accumulating timestamped files
+    AUTO_SAVE_FILENAME = "autosave.json"
+    
     def __init__(self, config_manager: ConfigurationManager = None):
         self.config_manager = config_manager or ConfigurationManager()
         self.logging_manager = LoggingManager(
@@ -810,6 +1115,9 @@ class InteractiveTrafficControlSystem:
         
         self.intersections: Dict[str, AdvancedTrafficLight] = {}
         self.sensors: Dict[str, TrafficSensor] = {}
+        # Stable iteration lists, rebuilt only when intersections/sensors are added
+        self._intersection_list: List[AdvancedTrafficLight] = []
+        self._sensor_list: List[TrafficSensor] = []
         self.monitoring_system = TrafficMonitoringSystem()
         self.emergency_system = EmergencyManagementSystem()
         
@@ -821,25 +1129,38 @@ class InteractiveTrafficControlSystem:
         self.is_pedestrian_scramble = False
         
         self.current_step = 0
-        self.step_log = []
+        self.step_log = deque(maxlen=1000)
+        # Rolling window of the steps included in saved state
+        self._recent_log = deque(maxlen=100)
+        self._rng = random.Random()
+        self.last_step_info: Optional[StepInfo] = None
+        
+        # Single I/O worker so persistence never stalls the simulation loop
+        # and background writes land on disk in the order they were requested
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TrafficSystemIO")
+        self._last_auto_save = time.monotonic()
+        self._auto_save_future: Optional[Future] = None
         
         self.logging_manager.log_event('INFO', 'Traffic Control System initialized')
     
     def add_intersection(self, config: IntersectionConfig):
         """Add a new intersection"""
         traffic_light = AdvancedTrafficLight(config.id, config)
+        traffic_light.specialize(self.power_outage, self.is_pedestrian_scramble)
         self.intersections[config.id] = traffic_light
-        self.logging_manager.log_event('INFO', f'Intersection added: {config.id}')
+        self._intersection_list = list(self.intersections.values())
+        self.logging_manager.log_event('INFO', 'Intersection added: %s', config.id)
     
     def add_sensor(self, sensor: TrafficSensor):
         """Add a new sensor"""
         self.sensors[sensor.id] = sensor
-        self.logging_manager.log_event('INFO', f'Sensor added: {sensor.id}')
+        self._sensor_list = list(self.sensors.values())
+        self.logging_manager.log_event('INFO', 'Sensor added: %s', sensor.id)
     
     def update_weather(self, weather: WeatherCondition):
         """Update weather conditions"""
         self.current_weather = weather
-        self.logging_manager.log_event('INFO', f'Weather updated to: {weather.value}')
+        self.logging_manager.log_event('INFO', 'Weather updated to: %s', weather.value)
 
     def load_scenario(self, scenario: Scenario):
         """Load a predefined scenario, matching HTML behavior"""
@@ -856,16 +1177,7 @@ class InteractiveTrafficControlSystem:
         else:
             self.config_manager.set('intersections.max_cars_per_lane', 4)
 
-        if scenario == Scenario.HEAVY_RAIN:
-            self.current_weather = WeatherCondition.RAIN
-        elif scenario == Scenario.SNOW_BLIZZARD:
-            self.current_weather = WeatherCondition.SNOW
-        elif scenario == Scenario.DENSE_FOG:
-            self.current_weather = WeatherCondition.FOG
-        elif scenario == Scenario.NIGHT:
-            self.current_weather = WeatherCondition.NIGHT
-        else:
-            self.current_weather = WeatherCondition.CLEAR
+        self.current_weather = self.SCENARIO_WEATHER.get(scenario, WeatherCondition.CLEAR)
 
         if self.power_outage:
             self.system_status = SystemStatus.FAILURE
@@ -873,44 +1185,62 @@ class InteractiveTrafficControlSystem:
         else:
             self.system_status = SystemStatus.NORMAL
 
-        self.logging_manager.log_event('INFO', f'Scenario loaded: {scenario.value}')
+        for light in self._intersection_list:
+            light.specialize(self.power_outage, self.is_pedestrian_scramble)
+
+        self.logging_manager.log_event('INFO', 'Scenario loaded: %s', scenario.value)
     
     def get_all_sensors(self) -> List[TrafficSensor]:
-        """Get all sensors"""
-        return list(self.sensors.values())
+        """Get all sensors (shared list, do not modify)"""
+        return self._sensor_list
     
     def get_intersection(self, intersection_id: str) -> Optional[AdvancedTrafficLight]:
         """Get intersection by ID"""
         return self.intersections.get(intersection_id)
     
-    def process_step(self) -> Dict:
+    def process_step(self) -> 'StepInfo':
         """Process one simulation step"""
         step_start = time.time()
         self.current_step += 1
         
-        # Update sensors
-        for sensor in self.sensors.values():
-            sensor.vehicle_count = max(0, sensor.vehicle_count + random.randint(-2, 3))
-            sensor.average_speed = max(5.0, min(80.0, sensor.average_speed + random.uniform(-5, 5)))
-            sensor.queue_length = max(0, min(20, sensor.queue_length + random.randint(-1, 2)))
-            sensor.last_update = datetime.now()
+        # Lights only flash during an outage, so sensor and analytics work is skipped
+        if self.power_outage:
+            return self._outage_step_info(step_start)
+        
+        # The step is a single instant: read the clock once and share it
+        now_ns = time.time_ns()
+        now = _ns_to_datetime(now_ns)
         
+        # Update sensors, drawing every sensor's increments for this step in bulk
         sensors = self.get_all_sensors()
-        analytics = self.monitoring_system.process_sensor_data(sensors)
+        n = len(sensors)
+        rng = self._rng
+        count_deltas = rng.choices(self.VEHICLE_COUNT_DELTAS, k=n)
+        queue_deltas = rng.choices(self.QUEUE_LENGTH_DELTAS, k=n)
+        rand = rng.random
+        speed_deltas = [rand() * 10.0 - 5.0 for _ in range(n)]
+        for sensor, count_delta, speed_delta, queue_delta in zip(sensors, count_deltas, speed_deltas, queue_deltas):
+            sensor.vehicle_count = max(0, sensor.vehicle_count + count_delta)
+            sensor.average_speed = max(5.0, min(80.0, sensor.average_speed + speed_delta))
+            sensor.queue_length = max(0, min(20, sensor.queue_length + queue_delta))
+            sensor.last_update_ns = now_ns
+        
+        aggregate = aggregate_sensors(sensors)
+        analytics = self.monitoring_system.process_sensor_data(sensors, aggregate)
         
         priority_vehicle = self.emergency_system.get_highest_priority_vehicle()
         emergency_level = priority_vehicle.emergency_level if priority_vehicle else EmergencyLevel.NONE
         
         # Update intersections
-        for intersection in self.intersections.values():
-            intersection.update_state(
-                self.current_step, 
-                sensors, 
-                self.current_weather, 
+        # Each light's update is pre-bound to the current scenario's variant
+        for intersection in self._intersection_list:
+            intersection.update(
+                self.current_step,
+                sensors,
+                self.current_weather,
                 emergency_level,
-                power_outage=self.power_outage,
-                is_scramble=self.is_pedestrian_scramble,
-                is_rush_hour=self.is_rush_hour
+                self.is_rush_hour,
+                aggregate
             )
         
         # Update metrics
@@ -918,31 +1248,78 @@ class InteractiveTrafficControlSystem:
         if analytics['anomalies']:
             self.performance_monitor.increment_metric('anomalies_detected', len(analytics['anomalies']))
         
-        step_info = {
-            'step': self.current_step,
-            'timestamp': datetime.now(),
-            'system_status': self.system_status.value,
-            'weather': self.current_weather.value,
-            'analytics': analytics,
-            'intersection_states': {
-                iid: {
-                    'state': light.current_state.value,
-                    'duration': light.get_current_state_duration(self.current_step),
-                    'cycle_count': light.cycle_count
-                } for iid, light in self.intersections.items()
-            },
-            'active_emergencies': len(self.emergency_system.active_emergencies)
-        }
+        step_info = StepInfo(
+            step=self.current_step,
+            timestamp=now,
+            system_status=self.system_status,
+            weather=self.current_weather,
+            analytics=analytics,
+            intersection_states=IntersectionStates(self.current_step, self._intersection_list),
+            active_emergencies=len(self.emergency_system.active_emergencies)
+        )
         
-        self.step_log.append(step_info)
-        if len(self.step_log) > 1000:
-            self.step_log = self.step_log[-1000:]
+        self._record_step(step_info)
+        self._auto_save()
         
         step_duration = time.time() - step_start
         self.performance_monitor.track_step(step_duration)
         
         return step_info
     
+    def _record_step(self, step_info: 'StepInfo'):
+        """Append a processed step to the step logs"""
+        self.step_log.append(step_info)
+        self._recent_log.append(step_info)
+        self.last_step_info = step_info
+    
+    def _auto_save(self):
+        """Queue a background state save once the configured auto-save interval has passed"""
+        interval = self.config_manager.get('system.auto_save_interval')
+        if not interval:
+            return
+        now = time.monotonic()
+        if now - self._last_auto_save < interval:
+            return
+        # Never queue a second auto-save behind one the worker hasn't finished
+        if self._auto_save_future is not None and not self._auto_save_future.done():
+            return
+        self._last_auto_save = now
+        self._auto_save_future = self.save_state(self.AUTO_SAVE_FILENAME, background=True)
+    
+    def _outage_step_info(self, step_start: float) -> 'StepInfo':
+        """Process a power outage step: flash the lights and carry the last readings forward"""
+        current_step = self.current_step
+        now = _ns_to_datetime(time.time_ns())
+        for light in self._intersection_list:
+            light.update(current_step, self._sensor_list, self.current_weather, EmergencyLevel.NONE)
+        
+        # Sensors are not refreshed during an outage, so the last totals still hold
+        last = self.last_step_info
+        analytics = {
+            'total_vehicles': last.analytics['total_vehicles'] if last else 0,
+            'average_speed': last.analytics['average_speed'] if last else 0.0,
+            'congestion_level': last.analytics['congestion_level'] if last else 0.0,
+            'anomalies': [],
+            'predictions': {}
+        }
+        
+        step_info = StepInfo(
+            step=current_step,
+            timestamp=now,
+            system_status=self.system_status,
+            weather=self.current_weather,
+            analytics=analytics,
+            intersection_states=IntersectionStates(current_step, self._intersection_list),
+            active_emergencies=len(self.emergency_system.active_emergencies)
+        )
+        
+        self._record_step(step_info)
+        self._auto_save()
+        
+        self.performance_monitor.track_step(time.time() - step_start)
+        
+        return step_info
+    
     def handle_emergency_vehicle(self, vehicle: Vehicle) -> Dict[str, Any]:
         """Handle emergency vehicle registration"""
         registered = self.emergency_system.register_emergency_vehicle(vehicle)
@@ -951,8 +1328,8 @@ class InteractiveTrafficControlSystem:
             return {'success': False, 'message': 'Vehicle is not an emergency vehicle'}
         
         priority = self.emergency_system.calculate_priority(vehicle, self.current_weather)
-        intersections = list(self.intersections.values())
-        config_list = [i.config for i in intersections]
+        # The priority route only covers the first three intersections
+        config_list = [light.config for light in self._intersection_list[:3]]
         route = self.emergency_system.generate_priority_route(vehicle, config_list)
         
         vehicle.priority = priority
@@ -969,7 +1346,11 @@ class InteractiveTrafficControlSystem:
     def get_system_status(self) -> Dict[str, Any]:
         """Get complete system status"""
         sensors = self.get_all_sensors()
-        analytics = self.monitoring_system.process_sensor_data(sensors)
+        # Sensor readings only change in process_step, so reuse its analytics
+        if self.last_step_info is not None:
+            analytics = self.last_step_info['analytics']
+        else:
+            analytics = self.monitoring_system.summarize_sensor_data(sensors)
         performance = self.performance_monitor.get_metrics_summary()
         health = self.performance_monitor.check_system_health()
         
@@ -985,20 +1366,31 @@ class InteractiveTrafficControlSystem:
             'health': health
         }
     
-    def save_state(self, filename: str = None) -> bool:
-        """Save system state"""
+    def save_state(self, filename: str = None, background: bool = False) -> Union[bool, Future]:
+        """Save system state, optionally returning a future for a write on the I/O worker"""
         state_data = {
             'timestamp': datetime.now().isoformat(),
             'system_status': self.get_system_status(),
-            'intersections': [light.to_dict() for light in self.intersections.values()],
-            'sensors': [sensor.to_dict() for sensor in self.sensors.values()],
-            'step_log': self.step_log[-100:]
+            'intersections': [light.to_dict() for light in self._intersection_list],
+            'sensors': [sensor.to_dict() for sensor in self._sensor_list],
+            'step_log': list(self._recent_log)
         }
+        if background:
+            return self._io_pool.submit(self.persistence_manager.save_system_state, state_data, filename)
         return self.persistence_manager.save_system_state(state_data, filename)
     
-    def export_analytics(self, format: str = "json") -> bool:
-        """Export analytics data"""
-        return self.persistence_manager.export_analytics(self.step_log, format)
+    def export_analytics(self, format: str = "json", background: bool = False) -> Union[bool, Future]:
+        """Export analytics data, optionally returning a future for a write on the I/O worker"""
+        if background:
+            return self._io_pool.submit(self.persistence_manager.export_analytics, list(self.step_log), format)
+        return self.persistence_manager.export_analytics(list(self.step_log), format)
+    
+    def flush_writes(self, timeout: Optional[float] = None) -> bool:
+        """Block until all background writes submitted so far have finished"""
+        # The single worker runs jobs in order, so a no-op marks everything before it
+        marker = self._io_pool.submit(lambda: None)
+        done, _ = wait([marker], timeout)
+        return bool(done)
     
     def generate_report(self) -> str:
         """Generate traffic report"""
@@ -1012,6 +1404,13 @@ class InteractiveTrafficControlSystem:
 class TrafficControlGUI:
     """GUI interface for traffic control system"""
     
+    STATE_EMOJI = {
+        TrafficLightState.RED: '🔴',
+        TrafficLightState.YELLOW: '🟡',
+        TrafficLightState.PRE_GREEN: '🔴🟡',
+        TrafficLightState.GREEN: '🟢'
+    }
+    
     def __init__(self, system: InteractiveTrafficControlSystem):
         self.system = system
         self.root = tk.Tk()
@@ -1019,7 +1418,7 @@ class TrafficControlGUI:
         self.root.geometry("1000x700")
         
         self.is_running = False
-        self.simulation_thread = None
+        self._tick_job = None
         
         self._create_widgets()
         self._update_display()
@@ -1089,7 +1488,6 @@ class TrafficControlGUI:
         status = self.system.get_system_status()
         
         # Update status text
-        self.status_text.delete(1.0, tk.END)
         status_info = f"""
 Step: {status['step']}
 System Status: {status['system_status']}
@@ -1105,21 +1503,17 @@ Traffic Analytics:
 
 Intersections:
 """
-        self.status_text.insert(1.0, status_info)
         
         # Add intersection states
+        lines = [status_info]
         for iid, light in self.system.intersections.items():
-            state_emoji = {
-                'RED': '🔴',
-                'YELLOW': '🟡',
-                'PRE_GREEN': '🔴🟡',
-                'GREEN': '🟢'
-            }.get(light.current_state.value, '⚪')
-            
-            self.status_text.insert(tk.END, f"  {iid}: {state_emoji} {light.current_state.value}\n")
+            state_emoji = self.STATE_EMOJI.get(light.current_state, '⚪')
+            lines.append(f"  {iid}: {state_emoji} {light.current_state.value}\n")
+        
+        # One Tk call per widget instead of a delete plus an insert per line
+        self.status_text.replace('1.0', tk.END, ''.join(lines))
         
         # Update metrics
-        self.metrics_text.delete(1.0, tk.END)
         metrics = status['performance']
         metrics_info = f"""
 Total Steps: {metrics['total_steps']}
@@ -1130,29 +1524,28 @@ Vehicles Processed: {metrics['total_vehicles_processed']}
 Emergency Responses: {metrics['emergency_responses']}
 Anomalies Detected: {metrics['anomalies_detected']}
 """
-        self.metrics_text.insert(1.0, metrics_info)
-        
-        if self.is_running:
-            self.root.after(1000, self._update_display)
+        self.metrics_text.replace('1.0', tk.END, metrics_info)
     
     def start_simulation(self):
         """Start continuous simulation"""
         self.is_running = True
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
-        
-        def run_simulation():
-            while self.is_running:
-                self.system.process_step()
-                time.sleep(0.5)
-        
-        self.simulation_thread = threading.Thread(target=run_simulation, daemon=True)
-        self.simulation_thread.start()
+        self._tick()
+    
+    def _tick(self):
+        """Run one simulation step on the Tk event loop and schedule the next"""
+        self.system.process_step()
         self._update_display()
+        if self.is_running:
+            self._tick_job = self.root.after(500, self._tick)
     
     def stop_simulation(self):
         """Stop simulation"""
         self.is_running = False
+        if self._tick_job is not None:
+            self.root.after_cancel(self._tick_job)
+            self._tick_job = None
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
     
@@ -1187,12 +1580,22 @@ Anomalies Detected: {metrics['anomalies_detected']}
         messagebox.showinfo("Emergency Vehicle", result['message'])
         self._update_display()
     
-    def save_state(self):
-        """Save system state"""
-        if self.system.save_state():
-            messagebox.showinfo("Success", "System state saved successfully!")
+    def _when_done(self, future: Future, callback):
+        """Call callback with the future's result on the Tk thread once it has finished"""
+        # Tk is not thread-safe, so poll from the event loop instead of add_done_callback
+        if future.done():
+            callback(future.result())
         else:
-            messagebox.showerror("Error", "Failed to save system state")
+            self.root.after(50, self._when_done, future, callback)
+    
+    def save_state(self):
+        """Save system state on the I/O worker and report the result when it lands"""
+        def report(saved: bool):
+            if saved:
+                messagebox.showinfo("Success", "System state saved successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to save system state")
+        self._when_done(self.system.save_state(background=True), report)
     
     def generate_report(self):
         """Generate and display report"""
@@ -1210,11 +1613,13 @@ Anomalies Detected: {metrics['anomalies_detected']}
                   command=lambda: self.system.report_generator.save_report(report)).pack(pady=5)
     
     def export_analytics(self):
-        """Export analytics data"""
-        if self.system.export_analytics("json"):
-            messagebox.showinfo("Success", "Analytics exported successfully!")
-        else:
-            messagebox.showerror("Error", "Failed to export analytics")
+        """Export analytics data on the I/O worker and report the result when it lands"""
+        def report(exported: bool):
+            if exported:
+                messagebox.showinfo("Success", "Analytics exported successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to export analytics")
+        self._when_done(self.system.export_analytics("json", background=True), report)
     
     def run(self):
         """Run the GUI application"""
@@ -1259,7 +1664,7 @@ def create_sample_setup() -> InteractiveTrafficControlSystem:
     
     return system
 
-def visualize_system_state(system: InteractiveTrafficControlSystem, step_info: Dict):
+def visualize_system_state(system: InteractiveTrafficControlSystem, step_info: StepInfo):
     """Text-based visualization"""
     print("\n" + "="*60)
     print("TRAFFIC CONTROL SYSTEM - STEP {}".format(step_info['step']))
@@ -1339,7 +1744,6 @@ def console_demo():
 ####################
 
 if __name__ == "__main__":
-    import sys
     import webbrowser
     import os
 
@@ -1386,5 +1790,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\n\n[*] System shutdown requested. Goodbye!")
     except Exception as e:
-        logging.error(f"System error: {e}")
+        logging.error("System error: %s", e)
         print(f"\n[ERROR] {e}")
\ No newline at end of file